@@ -1,6 +1,7 @@
+from functools import lru_cache
+from operator import itemgetter
 from typing import Literal
 from langgraph.graph import StateGraph, END
-from langgraph.prebuilt import ToolNode
 from agent.state import AgentState
 from agent.nodes import (
     plan_task_node,
@@ -11,73 +12,15 @@ from agent.nodes import (
     finalize_node,
 )
 from utils.logger import logger
-from tools.interaction import create_interaction_tools
-from tools.navigation import create_navigation_tools
 
 
-def should_continue_execution(state: AgentState) -> Literal["continue", "finalize"]:
-    """
-    Decide whether to continue executing plan goals or finalize.
-    
-    Args:
-        state: Current agent state
-        
-    Returns:
-        Next node name
-    """
-    if state.get("current_plan_step_ind") == len(state.get("task_plan").steps):
-        return "finalize"
-    
-    return "continue"
+# both keys are set by plan_task_node before the first routing decision, so no defaults are needed
+_continue_keys = itemgetter("current_plan_step_ind", "plan_step_count")
 
-def user_confirmed_action(state: AgentState) -> Literal["confirmed", "rejected"]:
-    """Checks whether current browser action was confirmed by user or not"""
-    if state.get("user_confirmed"):
-        return "confirmed"
-    return "rejected"
 
-def reflection_mapping(state: AgentState) -> Literal["proceed_with_next", "continue_current"]:
-    """Decides, based on reflect_browser_action_node, whether we should proceed to next plan goal or continue doing this one"""
-    return "proceed_with_next" if state.get("current_plan_goal_achieved") else "continue_current"
-
-# def should_seek_confirmation(state: AgentState) -> Literal["confirm", "verify"]:
-    """
-    Decide whether to seek user confirmation or proceed to verification.
-    
-    Args:
-        state: Current agent state
-        
-    Returns:
-        Next node name
-    """   
-    if state.get("pending_confirmation", None):
-        return "confirm"
-    return "verify"
-
-# def should_retry_or_abort(state: AgentState) -> Literal["execute", "finalize"]:
-    """
-    Decide whether to retry after error or abort task.
-    
-    Args:
-        state: Current agent state
-        
-    Returns:
-        Next node name
-    """
-    error_count = state.get("error_count", 0)
-    max_retries = 3  # TODO: Get from settings
-    
-    # TODO: Check if max retries exceeded
-    # TODO: Check if error is recoverable
-    # TODO: Return "execute" to retry, "finalize" to abort
-    
-    if error_count < max_retries:
-        return "execute"
-    return "finalize"
-
-# def should_handle_error(state: AgentState) -> Literal["error", "continue"]:
+def should_continue_execution(state: AgentState) -> Literal["continue", "finalize"]:
     """
-    Decide whether to handle error or continue to next action.
+    Decide whether to continue executing plan goals or finalize.
     
     Args:
         state: Current agent state
@@ -85,13 +28,9 @@ def reflection_mapping(state: AgentState) -> Literal["proceed_with_next", "conti
     Returns:
         Next node name
     """
-    # Check if we just encountered an error
-    if state.get("last_error"):
-        return "error"
-    
-    return "continue"
+    step_ind, step_count = _continue_keys(state)
+    return ("continue", "finalize")[step_ind == step_count]
 
-# Error handling is pending implementation
 
 def create_agent_graph() -> StateGraph:
     """
@@ -112,35 +51,21 @@ def create_agent_graph() -> StateGraph:
     logger.info("Creating agent graph...")
     
     workflow = StateGraph(AgentState)
-
-    tools = create_navigation_tools() + create_interaction_tools()
     
     workflow.add_node("plan", plan_task_node)
     workflow.add_node("choose_action", choose_next_action_node)
     workflow.add_node("confirm", seek_confirmation_node)
     workflow.add_node("reflect", reflect_browser_action_node)
-    workflow.add_node("perform_action", ToolNode(tools))
+    workflow.add_node("perform_action", perform_action_node)
     workflow.add_node("finalize", finalize_node)
-
-    # Dummy node for continue_check that just passes through
-    workflow.add_node("continue_check", lambda state: state)
     
     workflow.set_entry_point("plan")
     
     workflow.add_edge("plan", "choose_action")
     workflow.add_edge("choose_action", "confirm")
-    
-    workflow.add_conditional_edges(
-        "confirm",
-        user_confirmed_action,
-        {
-            "confirmed": "perform_action",
-            "rejected": "finalize",
-        }
-    )
+    # "confirm" routes itself to perform_action/finalize via Command
     
     workflow.add_edge("perform_action", "reflect")
-    workflow.add_edge("reflect", "choose_action")   
     
     workflow.add_conditional_edges(
         "reflect",
@@ -159,11 +84,11 @@ def create_agent_graph() -> StateGraph:
     return graph
 
 
-agent_graph = None
+@lru_cache(maxsize=1)
+def _build() -> StateGraph:
+    return create_agent_graph()
 
 
 def get_agent() -> StateGraph:
-    global agent_graph
-    if agent_graph is None:
-        agent_graph = create_agent_graph()
-    return agent_graph
+    # graph is compiled on first request and reused for the rest of the process
+    return _build()
@@ -1,19 +1,157 @@
-from typing import Dict, Any
+import asyncio
+import hashlib
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Literal
     
 from rich.console import Console
 from rich.panel import Panel
-from langchain_core.messages import HumanMessage, AIMessage, ToolMessage, SystemMessage
+from rich.markup import escape
+from langchain_core.messages import (
+    HumanMessage, AIMessage, ToolMessage, SystemMessage, message_chunk_to_message
+)
+from langgraph.types import Command
 
 from agent.state import AgentState
 from models.task import TaskPlan, DangerCheck, PlanGoalAchieved
 from utils.logger import logger
+from utils.stream_output import get_stream_output
 from services.llm import get_llm_service
-from tools.interaction import create_interaction_tools
-from tools.navigation import create_navigation_tools
+from services.llm_cache import get_llm_cache
+from tools import get_all_tools
+from services.tools_cache_manager import ElementsCacheManager
 from config.settings import settings
 
+_MAX_RETRIES = settings.max_retries  # bound once, read on every finalize
+_MAX_PARALLEL_TOOL_CALLS = settings.max_parallel_tool_calls
+_STEP_MESSAGES_WINDOW = settings.step_messages_window
 
-def plan_task_node(state: AgentState) -> Dict[str, Any]:
+_CONSOLE = Console()
+_YES_RESPONSES = frozenset({"yes", "y", "yeah", "yep", "ok"})
+
+# tool set is static, so it is built once instead of on every node call
+_TOOLS = get_all_tools()
+_TOOLS_BY_NAME = MappingProxyType({tool.name: tool for tool in _TOOLS})  # read-only view
+
+# prompt text does not change during a run
+_SAFETY_CHECK_MSG = SystemMessage(content=settings.get_prompt("safety_check"))
+
+
+async def _invoke_structured(schema: type, messages: list):
+    """
+    Invoke main LLM with structured output, reusing cached response for identical requests.
+    
+    Args:
+        schema: Pydantic model describing expected output
+        messages: Request messages
+        
+    Returns:
+        Instance of schema
+    """
+    if not settings.enable_llm_cache:
+        return await get_llm_service().get_structured_llm(schema).ainvoke(messages)
+
+    cache = get_llm_cache()
+    key = cache.make_key(settings.default_llm_model, schema, messages)
+    cached = cache.get(key)
+    if cached is not None:
+        return schema.model_validate_json(cached)
+
+    response = await get_llm_service().get_structured_llm(schema).ainvoke(messages)
+    cache.set(key, response.model_dump_json())
+    return response
+
+
+def _window_step_messages(messages: list) -> list:
+    """
+    Keep only the latest plan step messages, bounding per-step input tokens.
+    Leading tool results whose tool call fell out of the window are dropped too,
+    since the API rejects tool messages without a preceding tool call.
+    """
+    window = messages[-_STEP_MESSAGES_WINDOW:]
+    start = 0
+    while start < len(window) and isinstance(window[start], ToolMessage):
+        start += 1
+    return window[start:]
+
+
+def _message_text(content) -> str:
+    """Text of a message content; multimodal content blocks are joined instead of repr'd"""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            part if isinstance(part, str) else part.get("text", "")
+            for part in content
+            if isinstance(part, (str, dict))
+        )
+    return str(content)
+
+
+def _last_tool_calls_failed(messages: list) -> bool:
+    """Whether the tool results following the latest AIMessage are all errors"""
+    results = []
+    for msg in reversed(messages):
+        if isinstance(msg, AIMessage):
+            break
+        if isinstance(msg, ToolMessage):
+            results.append(msg)
+    return bool(results) and all(_message_text(msg.content)[:5] == "Error" for msg in results)
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# matched as whole words, so e.g. "incompleted" or "undone" do not count as completion
+_DONE_WORDS = frozenset({"completed", "done", "finished", "success"})
+_WORD_RE = re.compile(r"[a-z]+")
+_DONE_TAIL_SIZE = 256  # completion is reported at the end of the message
+
+# tools that only read or open pages; calls to any other tool (clicking, typing)
+# always go through the DangerCheck, as the safety prompt asks to confirm when in doubt
+_READ_ONLY_TOOLS = frozenset({
+    "get_element_context",
+    "get_interactive_elements",
+    "get_informative_elements",
+    "open_page",
+    "search_google",
+})
+
+
+def _describe_tool_call(tool_call, page_url) -> str:
+    """
+    Tool call as text for the safety check. Element selectors are opaque
+    (e.g. "#btn-42"), so the cached label and text of the target element are
+    added, letting the safety check see that e.g. a click hits "Place order".
+    """
+    description = f"{tool_call['name']} {tool_call['args']}"
+    selector = tool_call["args"].get("element_selector")
+    if selector is None or page_url is None:
+        return description
+    element = ElementsCacheManager().get_element(page_url, selector)
+    if not element:
+        return description
+    details = " ".join(
+        str(element[key])
+        for key in ("label", "contents", "aria_label", "title", "placeholder")
+        if element.get(key)
+    )
+    return f"{description} ({details})" if details else description
+
+
+def _plan_cache_key(user_request: str) -> str:
+    """Requests differing only in case or whitespace map to the same cached plan"""
+    normalized = _WHITESPACE_RE.sub(" ", user_request).strip().casefold()
+    return "plan:" + hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _llm_with_tools(tool_choice=None):
+    """Main LLM with all browser tools bound; built once per tool_choice"""
+    return get_llm_service().get_main_llm().bind_tools(_TOOLS, tool_choice=tool_choice)
+
+
+async def plan_task_node(state: AgentState) -> Dict[str, Any]:
     """
     Planning node: Analyzes user request and creates a task plan.
     
@@ -30,31 +168,42 @@ def plan_task_node(state: AgentState) -> Dict[str, Any]:
     """
     logger.info("Planning task...")
     
-    user_request = state.get("user_request")
+    user_request = state["user_request"]
 
-    llm = (
-        get_llm_service()
-        .get_main_llm()
-        .with_structured_output(TaskPlan)
-    )
-    
-    messages = state.get("messages") + [HumanMessage(content=user_request)]
+    request_msg = HumanMessage(content=user_request)
     
-    response = llm.invoke(messages)
-    response_msg = AIMessage(content=str(response))
+    plan_key = _plan_cache_key(user_request)
+    cached_plan = get_llm_cache().get(plan_key) if settings.enable_llm_cache else None
+    if cached_plan is not None:
+        logger.info("Reusing cached plan for the request")
+        response = TaskPlan.model_validate_json(cached_plan)
+        plan_json = cached_plan
+    else:
+        # called directly: the plan is cached under plan_key only, a second entry
+        # keyed by the messages could never be hit and would just take up room
+        response = await get_llm_service().get_structured_llm(TaskPlan).ainvoke(
+            [*state["messages"], request_msg]
+        )
+        plan_json = response.model_dump_json()
+        if settings.enable_llm_cache:
+            get_llm_cache().set(plan_key, plan_json)
+    # the same serialized plan feeds both the cache and the message history
+    response_msg = AIMessage(content=plan_json)
     
-    logger.info(f"Planning response received; steps are:")
+    logger.info("Planning response received; steps are:")
     for step in response.steps:
-        logger.info(f"{step}")
+        logger.info("{}", step)
     
     return {
         "task_plan": response,
+        "plan_step_count": len(response.steps),
         "current_plan_step_ind": 0,
-        "messages": [response_msg],
+        # only the delta is returned; add_messages appends it to the history
+        "messages": [request_msg, response_msg],
         "current_plan_step_messages": [response_msg],
     }
 
-def choose_next_action_node(state: AgentState) -> Dict[str, Any]:
+async def choose_next_action_node(state: AgentState) -> Dict[str, Any]:
     """
     Execution node: Decides what browser action should be taken next to achieve current plan goal and makes tool calls; execution though is mad eiwthin different node
     
@@ -69,41 +218,46 @@ def choose_next_action_node(state: AgentState) -> Dict[str, Any]:
     """
     logger.info("Choosing next action...")
 
-    tools = create_interaction_tools() + create_navigation_tools()
-
-    llm = (
-        get_llm_service()
-        .get_main_llm()
-        .bind_tools(tools)        
-    )
+    llm = _llm_with_tools()
 
-    # logger.info(f"{state.get('messages')}")
+    # lazy: the message history is only stringified when DEBUG is enabled
+    logger.opt(lazy=True).debug("messages: {}", lambda: state["messages"])
 
-    response = llm.invoke(state.get("messages"))
+    # streamed, so tokens reach the console as they are generated
+    response = None
+    async for chunk in llm.astream(state["messages"]):
+        response = chunk if response is None else response + chunk
+    if response is None:
+        raise RuntimeError("LLM returned an empty stream while choosing next action")
+    # the merged AIMessageChunk is turned into a plain AIMessage before it goes to state
+    response = message_chunk_to_message(response)
     for tool_call in response.tool_calls:
-        logger.info(f'TOOLCALL: {tool_call["name"]}, {tool_call["args"]}')
+        logger.info("TOOLCALL: {}, {}", tool_call["name"], tool_call["args"])
     
     return {
         "current_action": response.content,
         "messages": [response],
     }
 
-def reflect_browser_action_node(state: AgentState):
+async def reflect_browser_action_node(state: AgentState):
     """Validates current state of current plan goal - is succeded? 
     updates "current_goal_achieved" with True or False 
     and sets 'current_plan_step_ind' with relevant for now; if task completed, sets current_plan_step_ind to None"""
-    llm = (
-        get_llm_service()
-        .get_main_llm()
-        .with_structured_output(PlanGoalAchieved)
-    )
+    if _last_tool_calls_failed(state["messages"]):
+        # failed tool calls cannot have achieved the goal, no need to ask the LLM
+        logger.info("Last tool calls failed, current plan goal is not achieved")
+        return {}
 
-    step_ind = state.get("current_plan_step_ind")
-    goal = state.get("task_plan").steps[step_ind]
+    step_ind = state["current_plan_step_ind"]
+    goal = state["task_plan"].steps[step_ind]
     goal = f"current goal is: {goal}"
-    context = state.get("current_plan_step_messages") + [SystemMessage(content=goal)]
+    # goal is fixed for the whole plan step, so it leads the context and the
+    # growing step history stays a stable, cacheable prefix extension
+    context = [SystemMessage(content=goal), *_window_step_messages(state["current_plan_step_messages"])]
 
-    decision = llm.invoke(context)
+    # not cached: the answer depends on the page state reached by the last actions,
+    # which the message context alone does not capture
+    decision = await get_llm_service().get_structured_llm(PlanGoalAchieved).ainvoke(context)
     if decision.is_achieved:
         return {
             "messages": [SystemMessage(
@@ -114,84 +268,123 @@ def reflect_browser_action_node(state: AgentState):
         }
     return {}
 
-def seek_confirmation_node(state: AgentState) -> Dict[str, Any]:
+async def seek_confirmation_node(state: AgentState) -> Command[Literal["perform_action", "finalize"]]:
     """
     Confirmation node: Decides whether action is sensitive or not and requests user confirmation for sensitive ones.
     
     This node displays a confirmation request and waits for user input.
+    Routing is decided here as well, so state update and next node are applied in one step.
     
     Args:
         state: Current agent state
         
     Returns:
-        Updated state with user_confirmed flag
+        Command updating user_confirmed flag and routing to perform_action (confirmed) or finalize (rejected)
     """
     logger.info("Seeking user confirmation...")
     
-    console = Console()
-    action_to_check = state.get("current_action")
-    
-    llm = (
-        get_llm_service()
-        .get_main_llm()
-        .with_structured_output(DangerCheck)
-    )
+    console = _CONSOLE
+    action_to_check = state["current_action"]
+
+    tool_calls = getattr(state["messages"][-1], "tool_calls", None) or ()
+    if all(tc["name"] in _READ_ONLY_TOOLS for tc in tool_calls):
+        return Command(
+            update={"user_confirmed": True},
+            goto="perform_action",
+        )
 
+    page_url = state["browser_manager"].current_url
+    text_to_check = " ".join(
+        [action_to_check or ""] + [_describe_tool_call(tc, page_url) for tc in tool_calls]
+    ).strip()
+    
     messages = [
-        SystemMessage(content=settings.get_prompt("safety_check")),
-        AIMessage(content=state.get("current_action"))
+        _SAFETY_CHECK_MSG,
+        AIMessage(content=text_to_check)
     ]
 
-    res = llm.invoke(messages)
+    res = await _invoke_structured(DangerCheck, messages)
 
     if res.is_sensitive:
         logger.info(res.reasoning)
+        get_stream_output().flush()  # streamed text must precede the confirmation panel
         console.print(Panel(
-            f"[bold yellow]Confirmation Required[/bold yellow]\n\n{action_to_check}",
+            f"[bold yellow]Confirmation Required[/bold yellow]\n\n{escape(text_to_check)}",
             border_style="yellow"
         ))
         
-        response = console.input("[bold yellow]Proceed? (yes/no):[/bold yellow] ").strip().lower()
-        confirmed = response in ['yes', 'y']
+        response = await asyncio.to_thread(console.input, "[bold yellow]Proceed? (yes/no):[/bold yellow] ")
+        response = response.strip().lower()
+        confirmed = response in _YES_RESPONSES
 
         # TODO: If user rejected action, SystemMessage of representing it should be added to state messages queue!
         
-        logger.info(f"User {'confirmed' if confirmed else 'declined'} action")
+        logger.info("User {} action", "confirmed" if confirmed else "declined")
         
-        return {
-            "user_confirmed": confirmed,
-        }
+        return Command(
+            update={"user_confirmed": confirmed},
+            goto="perform_action" if confirmed else "finalize",
+        )
     
-    return {
-        "user_confirmed": True,
-    }
+    return Command(
+        update={"user_confirmed": True},
+        goto="perform_action",
+    )
 
 async def perform_action_node(state: AgentState) -> Dict[str, Any]:
+    """
+    Tool node: Executes the tool calls of the action chosen by choose_next_action_node.
+    
+    Read-only tools run concurrently; if any call of the turn may change the page
+    or the elements cache, all of them run one after another in the given order.
+    
+    Args:
+        state: Current agent state
+        
+    Returns:
+        Updated state with tool results added to messages and current plan step messages
+    """
+    answer = state["messages"][-1]
+    tool_calls = getattr(answer, "tool_calls", None) or ()
+    step_messages = [*state["current_plan_step_messages"], answer]
+    if not tool_calls:
+        return {"current_plan_step_messages": step_messages}
 
-    tools = create_interaction_tools() + create_navigation_tools()
-    tools_by_name = {tool.name: tool for tool in tools}
-    llm = (
-        get_llm_service()
-        .get_main_llm()
-        .bind_tools(tools, tool_choice="auto")
-    )
+    tools_by_name = _TOOLS_BY_NAME
 
-    goal = f"execute this task step: {state.get('current_action').description}"
-    sys_msg = SystemMessage(content=goal)
-    context = state.get("current_plan_step_messages") + [sys_msg]
+    async def run_tool_call(tool_call) -> ToolMessage:
+        # a failing call becomes an error observation instead of cancelling its siblings
+        try:
+            observation = await tools_by_name[tool_call["name"]].ainvoke(tool_call["args"])
+        except Exception as e:
+            logger.error("Tool {} failed: {}", tool_call["name"], e)
+            return ToolMessage(
+                content=f"Error: {e!r}",
+                name=tool_call["name"],
+                tool_call_id=tool_call["id"],
+                status="error",
+            )
+        return ToolMessage(content=observation, name=tool_call["name"], tool_call_id=tool_call["id"])
 
-    answer = llm.invoke(context)
-    result = [answer]
-    for tool_call in answer.tool_calls:
-        tool = tools_by_name[tool_call["name"]]
-        observation = await tool.ainvoke(tool_call["args"])
-        result.append(ToolMessage(content=observation, tool_call_id=tool_call["id"]))
-    
+    if all(getattr(tools_by_name.get(tc["name"]), "parallel_safe", False) for tc in tool_calls):
+        # bounded, so a long batch of calls does not flood the CDP connection
+        semaphore = asyncio.Semaphore(_MAX_PARALLEL_TOOL_CALLS)
+
+        async def run_bounded(tool_call) -> ToolMessage:
+            async with semaphore:
+                return await run_tool_call(tool_call)
+
+        observations = await asyncio.gather(*(run_bounded(tc) for tc in tool_calls))
+    else:
+        observations = [await run_tool_call(tc) for tc in tool_calls]
+
+    step_messages.extend(observations)
     return {
-        "messages": result,
-        "current_plan_step_messages": context + result
+        "messages": observations,
+        "current_plan_step_messages": step_messages,
     }
-    
+
+
 def finalize_node(state: AgentState) -> Dict[str, Any]:
     """
     Finalization node: Wraps up task execution and reports results.
@@ -208,26 +401,27 @@ def finalize_node(state: AgentState) -> Dict[str, Any]:
     
     messages = state.get("messages")
     error_count = state.get("error_count", 0)
+
+    if error_count >= _MAX_RETRIES or state.get("user_confirmed") is False:
+        # a plan that failed or was declined by the user is not reused when
+        # the same request is tried again
+        get_llm_cache().delete(_plan_cache_key(state["user_request"]))
     
     # Check if there were too many errors
-    if error_count >= 3:
+    if error_count >= _MAX_RETRIES:
         return {
             "success": False,
             "final_message": f"Task failed after {error_count} errors. Please try again or rephrase your request.",
         }
     
-    # # Summarize based on messages
-    # if messages:
-    #     last_msg = messages[-1]
-    #     if hasattr(last_msg, 'content'):
-    #         content = str(last_msg.content)
-            
-    #         completion_indicators = ["completed", "done", "finished", "success"]
-    #         if any(indicator in content.lower() for indicator in completion_indicators):
-    #             return {
-    #                 "success": True,
-    #                 "final_message": "Task completed successfully!",
-    #             }
+    # Summarize based on messages
+    last_msg = messages[-1] if messages else None
+    content = _message_text(getattr(last_msg, "content", ""))
+    if not _DONE_WORDS.isdisjoint(_WORD_RE.findall(content[-_DONE_TAIL_SIZE:].lower())):
+        return {
+            "success": True,
+            "final_message": "Task completed successfully!",
+        }
     
     return {
         "success": True,
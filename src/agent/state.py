@@ -1,8 +1,8 @@
 from typing import Annotated, List, Optional
-from typing_extensions import TypedDict
+from typing_extensions import NotRequired, TypedDict
 
 from langgraph.graph import add_messages
-from langchain_core.messages import SystemMessage, AIMessage, HumanMessage
+from langchain_core.messages import SystemMessage, AIMessage, HumanMessage, ToolMessage
 from models.task import TaskPlan
 from browser.manager import BrowserManager
 
@@ -10,46 +10,41 @@ from config.settings import settings
 
 
 class AgentState(TypedDict):
+    # only user_request, messages and browser_manager are set by create_initial_state;
+    # the other keys are filled in by the nodes that produce them
     user_request: str
     # Messages exchanged with the LLM (for reasoning)
-    messages: Annotated[List[AIMessage | SystemMessage | HumanMessage], add_messages]
-    task_plan: Optional[TaskPlan]
+    messages: Annotated[List[AIMessage | SystemMessage | HumanMessage | ToolMessage], add_messages]
+    task_plan: NotRequired[Optional[TaskPlan]]
+    plan_step_count: NotRequired[int]  # len(task_plan.steps), stored once the plan is made
 
-    current_plan_step_ind: Optional[int]
-    current_plan_step_messages: Optional[List[AIMessage | SystemMessage]]
-    current_action: Optional[str]
+    current_plan_step_ind: NotRequired[Optional[int]]
+    current_plan_step_messages: NotRequired[Optional[List[AIMessage | SystemMessage | ToolMessage]]]
+    current_action: NotRequired[Optional[str]]
     
     # execution_results: List[ExecutionResult]
     browser_manager: BrowserManager
     
-    error_count: int
-    last_error: Optional[str]
+    error_count: NotRequired[int]
+    last_error: NotRequired[Optional[str]]
     
-    user_confirmed: bool
+    user_confirmed: NotRequired[bool]
     
-    final_message: Optional[str]
-    success: bool
+    final_message: NotRequired[Optional[str]]
+    success: NotRequired[bool]
     
-    current_url: Optional[str]
+    current_url: NotRequired[Optional[str]]
+
+
+# main agent prompt is static, so the system message is built once at import
+_SYS_PROMPT = SystemMessage(content=settings.get_prompt("main_agent"), id=1)
 
 
 def create_initial_state(user_request: str) -> AgentState:
-    sys_prompt = SystemMessage(content=settings.get_prompt("main_agent"), id=1)
-    return AgentState(
-        user_request=user_request,
-        messages=[sys_prompt],
-        task_plan=None,
-        current_plan_step_ind=None,
-        current_plan_step_messages=[],
-        current_action=None,
-        execution_results=[],
-        browser_manager=BrowserManager(),
-        error_count=0,
-        last_error=None,
-        pending_confirmation=None,
-        user_confirmed=False,
-        final_message=None,
-        success=False,
-        current_url=None,
-        screenshots_taken=[],
-    )
+    # only the keys nodes read before writing them are seeded; the plan node sets
+    # the plan and step keys, and the rest stay unset until a node returns them
+    return {
+        "user_request": user_request,
+        "messages": [_SYS_PROMPT],
+        "browser_manager": BrowserManager(),
+    }
@@ -1,20 +1,66 @@
-from typing import Any, Dict, Optional, List
-from playwright.async_api import Page, Locator
+import asyncio
+from typing import Any, ClassVar, Dict, Iterator, Optional, List, Tuple
+from playwright.async_api import Page
 from utils.logger import logger
 
 
+_ENABLABLE_TAGS = frozenset({'input', 'button', 'select', 'textarea'})  # tags supporting "disabled"
+
+# describes every visible element of the given array; kept at module level
+# so the same script text is sent on every call
+_DESCRIBE_INTERACTIVE_JS = '''(elements) => {
+    const described = [];
+    // long texts are cut here, so only the part actually used crosses the wire
+    const clip = (text) => text && text.length > 200 ? text.slice(0, 197) + '...' : text;
+    // label texts by the id they point to, collected in one scan instead of a query per element
+    const labels = new Map();
+    for (const l of document.querySelectorAll('label[for]')) {
+        if (!labels.has(l.htmlFor)) labels.set(l.htmlFor, l.innerText);
+    }
+    for (const el of elements) {
+        // hidden elements are dropped here, so they are never described nor sent back
+        if (!(el.offsetParent || el.getClientRects().length)
+            || getComputedStyle(el).visibility === 'hidden') continue;
+        const tagName = el.tagName.toLowerCase();
+        let label = (el.id && labels.get(el.id)) || null;
+        if (!label && ['input', 'textarea', 'select'].includes(tagName)) {
+            label = el.closest('label')?.innerText || null;
+        }
+        const isField = ['input', 'textarea'].includes(tagName);
+        described.push({
+            tagName: tagName,
+            id: el.id || null,
+            name: el.name || null,
+            type: el.type || null,
+            placeholder: el.placeholder || null,
+            ariaLabel: el.getAttribute('aria-label') || null,
+            role: el.getAttribute('role') || null,
+            href: el.href || null,
+            title: el.title || null,
+            enabled: !el.disabled,
+            text: (isField ? el.value : clip(el.innerText)) || '',
+            label: clip(label),
+        });
+    }
+    return described;
+}'''
+
+
 class ElementLocator:
     """
     Provides intelligent page element location strategies.
     """
 
-    _informative_roles = {
+    _informative_roles: ClassVar[frozenset] = frozenset({
         'article', 'section', 'paragraph', 'listitem', 'blockquote', 
         'heading', 'text', 'list', 'figure', 'img', 'link',
         'code', 'pre', 'table', 'row', 'cell',
         'definition', 'term', 'note', 'complementary',
         'navigation', 'region', 'contentinfo', 'banner', 'text leaf'
-    }  # roles of A11y tree elements those may hold valuable textual information
+    })  # roles of A11y tree elements those may hold valuable textual information
+    _TEXT_AGGREGATING_ROLES: ClassVar[frozenset] = frozenset({
+        'article', 'section', 'paragraph', 'listitem', 'blockquote'
+    })  # roles whose contents are the texts of their descendants
 
     _interactive_selectors = {
         'input': 'input:not([type="hidden"])',
@@ -49,6 +95,7 @@ class ElementLocator:
         
         'contenteditable': '[contenteditable="true"]',
     }  # HTML selectors those are pointing on interactive elements (buttons, links, etc.)
+    _combined_interactive_selector: ClassVar[str] = ", ".join(_interactive_selectors.values())
 
     def __init__(self):
         pass
@@ -62,10 +109,28 @@ class ElementLocator:
             logger.warning("No accessibility tree available")
             return []
                
-        informative_elements = self._extract_informative_nodes(accessibility_tree, [])
+        informative_elements = list(self._extract_informative_nodes(accessibility_tree))
         logger.info(f"Extracted {len(informative_elements)} informative elements")
         return informative_elements
     
+    async def list_all(self, page: Page) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Get informative and interactive elements of the page at once.
+        Both scans are independent, so the accessibility snapshot and the
+        interactive elements evaluate run concurrently.
+        
+        Args:
+            page: The Playwright page to analyze
+            
+        Returns:
+            Tuple of (informative elements, interactive elements)
+        """
+        informative, interactive = await asyncio.gather(
+            self.list_informative_elements(page),
+            self.list_interactive_elements(page),
+        )
+        return informative, interactive
+
     async def list_interactive_elements(self, page: Page) -> List[Dict[str, Any]]:
         """
         Get a list of all interactive elements on the page.
@@ -92,109 +157,66 @@ class ElementLocator:
             }
         """
         logger.info("Analyzing page for interactive elements...")
-        
+
+        # one compound selector is resolved and every match is described inside
+        # the page in a single round trip, instead of several CDP calls per element
+        try:
+            raw_elements = await page.locator(self._combined_interactive_selector).evaluate_all(
+                _DESCRIBE_INTERACTIVE_JS
+            )
+        except Exception as e:
+            logger.debug(f"Error describing interactive elements: {e}")
+            return []
+
         interactive_elements = []
-        element_id_counter = 0
-        
-        for _, selector in self._interactive_selectors.items():
-            try:
-                elements = await page.locator(selector).all()
-                
-                for element in elements:
-                    try:
-                        if not await element.is_visible() and not await element.count():
-                            continue
-                        
-                        element_id_counter += 1
-                        
-                        tag_name = await element.evaluate('el => el.tagName.toLowerCase()')
-                        is_enabled = await element.is_enabled() if tag_name in ['input', 'button', 'select', 'textarea'] else True
-                        
-                        contents = ""
-                        try:
-                            if tag_name in ['input', 'textarea']:
-                                contents = await element.input_value() or ""
-                            else:
-                                contents = await element.inner_text()
-                                if len(contents) > 200:
-                                    contents = contents[:197] + "..."
-                        except:
-                            contents = ""
-                        
-                        attributes = await element.evaluate('''el => {
-                            return {
-                                id: el.id || null,
-                                name: el.name || null,
-                                type: el.type || null,
-                                placeholder: el.placeholder || null,
-                                ariaLabel: el.getAttribute('aria-label') || null,
-                                role: el.getAttribute('role') || null,
-                                value: el.value || null,
-                                href: el.href || null,
-                                title: el.title || null,
-                                alt: el.alt || null,
-                                class: el.className || null
-                            }
-                        }''')
-                        
-                        label = None
-                        try:
-                            if attributes.get('id'):
-                                label_element = await page.locator(f'label[for="{attributes["id"]}"]')
-                                if await label_element.count() > 0:
-                                    label = await label_element.first.inner_text()
-                            
-                            if not label and tag_name in ['input', 'textarea', 'select']:
-                                parent_label = await element.evaluate('''el => {
-                                    const label = el.closest('label');
-                                    return label ? label.innerText : null;
-                                }''')
-                                if parent_label:
-                                    label = parent_label
-                        except:
-                            pass
-                        
-                        selector_str = await self._generate_selector(element, attributes)
-                        
-                        element_info = {
-                            "id": attributes.get('id'),
-                            "tag_name": tag_name,
-                            "contents": contents.strip(),
-                            "label": label.strip() if label else None,
-                            "placeholder": attributes.get('placeholder'),
-                            "aria_label": attributes.get('ariaLabel'),
-                            "role": attributes.get('role'),
-                            "selector": selector_str,
-                            "is_enabled": is_enabled,
-                            "name": attributes.get('name'),
-                            "href": attributes.get('href'),
-                            "title": attributes.get('title'),
-                            "input_type": attributes.get('type') if tag_name == 'input' else None,
-                        }
-                        
-                        # I (dev) remove None values to reduce token cost
-                        element_info = {k: v for k, v in element_info.items() if v is not None}
-                        interactive_elements.append(element_info)
-                        
-                    except Exception as e:
-                        logger.debug(f"Error processing element: {e}")
-                        continue
-                        
-            except Exception as e:
-                logger.debug(f"Error with selector '{selector}': {e}")
-                continue
+        for attributes in raw_elements:
+            tag_name = attributes['tagName']
+            is_enabled = attributes['enabled'] if tag_name in _ENABLABLE_TAGS else True
+
+            contents = attributes['text']  # already truncated in the page
+
+            label = attributes['label']
+
+            element_info = {
+                "tag_name": tag_name,
+                "contents": contents.strip(),
+                "selector": self._generate_selector(tag_name, attributes),
+                "is_enabled": is_enabled,
+            }
+
+            # I (dev) add optional values only when present to reduce token cost
+            if attributes['id'] is not None:
+                element_info["id"] = attributes['id']
+            if label:
+                element_info["label"] = label.strip()
+            if attributes['placeholder'] is not None:
+                element_info["placeholder"] = attributes['placeholder']
+            if attributes['ariaLabel'] is not None:
+                element_info["aria_label"] = attributes['ariaLabel']
+            if attributes['role'] is not None:
+                element_info["role"] = attributes['role']
+            if attributes['name'] is not None:
+                element_info["name"] = attributes['name']
+            if attributes['href'] is not None:
+                element_info["href"] = attributes['href']
+            if attributes['title'] is not None:
+                element_info["title"] = attributes['title']
+            if tag_name == 'input' and attributes['type'] is not None:
+                element_info["input_type"] = attributes['type']
+
+            interactive_elements.append(element_info)
         
         logger.info(f"Found {len(interactive_elements)} interactive elements")
         
         return interactive_elements
     
     @staticmethod
-    async def _generate_selector(element: Locator, attributes: Dict[str, Any]) -> str:
+    def _generate_selector(tag_name: str, attributes: Dict[str, Any]) -> str:
         """
         Generate a stable CSS selector for an element.
         
         Args:
-            element: The Playwright async locator
+            tag_name: Lowercased HTML tag name of the element
             attributes: Dictionary of element attributes
             
         Returns:
@@ -204,58 +226,51 @@ class ElementLocator:
             return f"#{attributes['id']}"
         
         if attributes.get('name'):
-            tag_name = await element.evaluate('el => el.tagName.toLowerCase()')
             return f"{tag_name}[name='{attributes['name']}']"
         
         return "unknown"
 
+    @staticmethod
+    def _collect_text(root) -> List[str]:
+        """Names of text nodes under root (root included), in document order"""
+        texts = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if 'text' in (node.get('role') or '') and node.get('name'):
+                texts.append(node['name'])
+            stack.extend(reversed(node.get('children', [])))
+        return texts
+
     @classmethod
-    def _extract_informative_nodes(
-        cls, 
-        node, 
-        # informative_elements: List[Dict[str, str]]
-    ) -> List[Dict[str, str]]:
+    def _extract_informative_nodes(cls, root) -> Iterator[Dict[str, str]]:
         """
-        Recursively extract informative elements from the Accessibility tree.
-        "leafs" of the tree are closer to the beginning of the returned list 
+        Lazily extract informative elements from the Accessibility tree.
+        "leafs" of the tree are yielded first 
         """
-        role = node.get('role')
-        name = node.get('name', '').strip()
-        informative_elements = []
-        
-        if role in cls._informative_roles:
-            content = name
-            
-            if role in {'article', 'section', 'paragraph', 'listitem', 'blockquote'}:
-                child_texts = []
-                
-                def collect_text(n, child_texts):
-                    if 'text' in n.get('role') and n.get('name'):
-                        child_texts.append(n.get('name'))
-                    for child in n.get('children', []):
-                        child_texts = collect_text(child, child_texts) + child_texts
-                    return child_texts
-                        
-                child_texts = collect_text(node, [])
+        # post-order walk with an explicit stack, visiting later siblings first;
+        # a node is yielded after all of its descendants
+        stack = [(root, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if not children_done:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.get('children', []))
+                continue
+
+            role = node.get('role')
+            if role not in cls._informative_roles:
+                continue
+
+            content = node.get('name', '').strip()
+            if role in cls._TEXT_AGGREGATING_ROLES:
+                child_texts = cls._collect_text(node)
                 
                 if child_texts:
                     content = '\n'.join(child_texts)
             
             if content:
-                informative_elements.append({
+                yield {
                     'role': role,
                     'contents': content
-                })
-        
-        children_info = []
-        for child in node.get('children', []):
-            child_info = cls._extract_informative_nodes(
-                child, 
-                # informative_elements,
-            )
-            children_info = child_info + children_info
-        informative_elements = children_info + informative_elements
-        
-        # logger.info(f"NODE: {role}|{name}; \nCONTENTS:{informative_elements}")
-
-        return informative_elements
+                }
@@ -1,5 +1,5 @@
+import threading
 from typing import Optional, List
-# from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page, Playwright
 from playwright.async_api import async_playwright, Page, BrowserContext, Browser, Playwright
 from config.settings import settings
 from utils.logger import logger
@@ -7,11 +7,14 @@ from utils.logger import logger
 
 class Singleton(type):
     _instances = dict()
+    _lock = threading.Lock()
 
     def __call__(cls, *args, **kwargs):
+        # fast path without locking once the instance exists
         if cls not in cls._instances:
-            instance = super().__call__(*args, **kwargs)
-            cls._instances[cls] = instance
+            with cls._lock:
+                if cls not in cls._instances:
+                    cls._instances[cls] = super().__call__(*args, **kwargs)
         return cls._instances[cls]
 
 
@@ -22,11 +25,15 @@ class BrowserManager(metaclass=Singleton):
     """
     
     def __init__(self):
+        if getattr(self, "_initialized", False):
+            return
+        self._initialized = True
         self._playwright: Optional[Playwright] = None
         self._browser: Optional[Browser] = None
         self._context: Optional[BrowserContext] = None
         self._current_page: Optional[Page] = None
         self._started = False
+        self._default_timeout = settings.browser_timeout  # applied to every page we hand out
     
     async def start(self, cdp_url: str = "http://localhost:9222") -> Page:
         """
@@ -49,7 +56,7 @@ class BrowserManager(metaclass=Singleton):
             Exception: If connection fails or no pages are available
         """
         if self._started:
-            return
+            return self._current_page
         logger.info(f"Connecting to existing Chromium browser at {cdp_url}...")
         
         try:
@@ -77,7 +84,7 @@ class BrowserManager(metaclass=Singleton):
             else:
                 self._current_page = pages[-1]
             
-            self._current_page.set_default_timeout(settings.browser_timeout)
+            self._current_page.set_default_timeout(self._default_timeout)
             
             logger.info(f"Browser connection established. Current URL: {self._current_page.url}")
             self._started = True
@@ -89,11 +96,11 @@ class BrowserManager(metaclass=Singleton):
             raise Exception(f"Could not connect to browser at {cdp_url}. "
                           f"Make sure Chromium is running with: chromium --remote-debugging-port=9222") from e
     
-    def stop(self) -> None:      
-        self._cleanup()
+    async def stop(self) -> None:      
+        await self._cleanup()
         logger.info("Successfully disconnected from browser")
     
-    def _cleanup(self) -> None:
+    async def _cleanup(self) -> None:
         if self._context:
             try:
                 self._context = None
@@ -102,7 +109,7 @@ class BrowserManager(metaclass=Singleton):
         
         if self._browser:
             try:
-                self._browser.close()
+                await self._browser.close()
                 logger.debug("Disconnected from browser")
                 self._browser = None
             except Exception as e:
@@ -110,35 +117,36 @@ class BrowserManager(metaclass=Singleton):
         
         if self._playwright:
             try:
-                self._playwright.stop()
+                await self._playwright.stop()
                 logger.debug("Playwright stopped")
                 self._playwright = None
             except Exception as e:
                 logger.warning(f"Error stopping Playwright: {e}")
         
         self._current_page = None
+        self._started = False
     
-    def new_page(self) -> Page:
+    async def new_page(self) -> Page:
         if not self._context:
             raise Exception("Browser not connected. Call start() first.")
         
         logger.info("Creating new page...")
-        page = self._context.new_page()
-        page.set_default_timeout(settings.browser_timeout)
+        page = await self._context.new_page()
+        page.set_default_timeout(self._default_timeout)
         
         self._current_page = page
         
         logger.info(f"New page created: {page.url}")
         return page
     
-    def close_page(self, page: Page) -> None:
+    async def close_page(self, page: Page) -> None:
         if not page:
             return
         
         logger.info(f"Closing page: {page.url}")
         
         try:
-            page.close()
+            await page.close()
             if self._current_page == page:
                 if self._context and self._context.pages:
                     self._current_page = self._context.pages[-1]
@@ -150,7 +158,7 @@ class BrowserManager(metaclass=Singleton):
         except Exception as e:
             logger.error(f"Error closing page: {e}")
     
-    def switch_to_page(self, page_index: int = -1) -> Optional[Page]:
+    async def switch_to_page(self, page_index: int = -1) -> Optional[Page]:
         if not self._context:
             logger.warning("Browser not connected")
             return None
@@ -163,7 +171,7 @@ class BrowserManager(metaclass=Singleton):
         
         try:
             self._current_page = pages[page_index]
-            self._current_page.bring_to_front()
+            await self._current_page.bring_to_front()
             logger.info(f"Switched to page {page_index}: {self._current_page.url}")
             return self._current_page
         except IndexError:
@@ -194,11 +202,11 @@ class BrowserManager(metaclass=Singleton):
     def is_connected(self) -> bool:
         return self._browser is not None and self._current_page is not None
     
-    def __enter__(self):
-        """Context manager entry."""
-        self.start()
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self.start()
         return self
     
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit."""
-        self.stop()
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.stop()
@@ -1,4 +1,7 @@
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -14,6 +17,8 @@ class Settings(BaseSettings):
     deepseek_base_url: str = "https://api.deepseek.com/"
     
     default_llm_model: str = "deepseek-chat"
+    enable_llm_cache: bool = True  # reuse structured responses for identical requests
+    llm_cache_size: int = 256
     
     browser_headless: bool = False
     browser_slow_mo: int = 100
@@ -23,6 +28,8 @@ class Settings(BaseSettings):
     context_request_depth: int = 5  # defines how deep into 
     # parent blocks can agent go, requesting additional context on an element.
     # max_task_steps: Optional[int] = None
+    step_messages_window: int = Field(default=20, gt=0)  # how many latest plan step messages are sent to the LLM
+    max_parallel_tool_calls: int = Field(default=8, gt=0)  # bound on read-only tool calls run concurrently
     require_confirmation_for_sensitive: bool = True
     
     log_level: str = "INFO"
@@ -38,10 +45,28 @@ class Settings(BaseSettings):
         return self.project_root / "config" / "prompts"
     
     def get_prompt(self, prompt_name: str) -> str:
-        prompt_path = self.prompts_dir / f"{prompt_name}.txt"
-        if not prompt_path.exists():
-            raise FileNotFoundError(f"Prompt file not found: {prompt_path}")
-        return prompt_path.read_text(encoding="utf-8")
+        return _read_prompt(str(self.prompts_dir / f"{prompt_name}.txt"))
 
 
-settings = Settings()
+@lru_cache(maxsize=None)
+def _read_prompt(path: str) -> str:
+    # prompt files are static per-process, so each one is read from disk once;
+    # use _read_prompt.cache_clear() to force a re-read
+    try:
+        return Path(path).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Prompt file not found: {path}") from None
+
+
+_settings: Optional[Settings] = None
+
+
+def __getattr__(name: str):
+    # `settings` is built on first access (PEP 562), so env/.env parsing is
+    # deferred until some module actually needs configuration
+    global _settings
+    if name == "settings":
+        if _settings is None:
+            _settings = Settings()
+        return _settings
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
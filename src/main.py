@@ -1,26 +1,32 @@
 import sys
 import asyncio
-from typing import Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
 
 import click
-from rich.console import Console
-from rich.panel import Panel
-from langgraph.graph.state import CompiledStateGraph
-from langchain_core.messages import AIMessage, ToolMessage, AIMessageChunk
-
-from agent.graph import get_agent
-from agent.state import create_initial_state
-from browser.manager import BrowserManager
-from config.settings import settings
+
 from utils.logger import setup_logger, logger
+from utils.stream_output import get_stream_output
+
+# rich, LangChain/LangGraph and the agent modules are imported where they are
+# first needed, so `--help` and argument errors do not pay for loading them
+if TYPE_CHECKING:
+    from rich.console import Console
+    from langgraph.graph.state import CompiledStateGraph
+    from browser.manager import BrowserManager
+
 
-console = Console()
+@lru_cache(maxsize=1)
+def _get_console() -> "Console":
+    from rich.console import Console
+    return Console()
 
 
 async def execute_task(
     task: str, 
     debug: bool = False,
-    agent: Optional[CompiledStateGraph] = None,
+    agent: Optional["CompiledStateGraph"] = None,
+    browser_manager: Optional["BrowserManager"] = None,
 ) -> None:
     """
     Run a single task with the agent.
@@ -28,10 +34,22 @@ async def execute_task(
     Args:
         task: Natural language task description
         debug: Whether to run in debug mode
+        agent: Compiled agent graph to reuse; built on demand if not given
+        browser_manager: Already connected browser manager to reuse
     """
+    from rich.panel import Panel
+    from langchain_core.messages import AIMessageChunk
+    from agent.graph import get_agent
+    from agent.state import create_initial_state
+    from browser.manager import BrowserManager
+    from config.settings import settings
+
+    console = _get_console()
     log_level = "DEBUG" if debug else settings.log_level
     setup_logger(log_level)
-    await BrowserManager().start()
+    if browser_manager is None:
+        browser_manager = BrowserManager()
+        await browser_manager.start()
     
     console.print(Panel.fit(
         f"[bold cyan]Task:[/bold cyan] {task}",
@@ -54,36 +72,49 @@ async def execute_task(
             "recursion_limit": 100,
         }
 
-        async for chunk, _ in agent.astream(
-            initial_state, 
-            stream_mode="messages",
-            config=config,
-        ):
-            step_count += 1
+        output = get_stream_output()
+        current_node = None
+        try:
+            async for chunk, metadata in agent.astream(
+                initial_state, 
+                stream_mode="messages",
+                config=config,
+            ):
+                step_count += 1
 
-            if isinstance(chunk, AIMessageChunk):
-                if chunk.content:
-                    print(chunk.content, end="", flush=True)
-            
-            # Show progress
-            # for node_name, node_output in event.items():
-            #     logger.debug(f"Node {node_name} executed")
+                # text of one node is never held back while another node runs
+                node = metadata.get("langgraph_node")
+                if node != current_node:
+                    output.flush()
+                    current_node = node
+
+                if isinstance(chunk, AIMessageChunk):
+                    if chunk.content:
+                        output.write(chunk.content)
+                else:
+                    output.flush()
                 
-            #     # Show messages from tools
-            #     if "messages" in node_output:
-            #         messages = node_output["messages"]
-            #         if messages:
-            #             for msg in messages:
-            #                 if hasattr(msg, 'content') and msg.content:
-            #                     # Only show tool messages and important AI responses
-            #                     if type(msg) == ToolMessage:
-            #                         console.print(f"[dim]→ {str(msg.content)[:200]}...[/dim]")
-            #                     elif type(msg) == AIMessage:
-            #                         #  and not hasattr(msg, 'tool_calls')
-            #                         console.print(f"[cyan]AI: {str(msg.content)[:200]}...[/cyan]")
-            
-            # if event:
-            #     final_state = list(event.values())[0]
+                # Show progress
+                # for node_name, node_output in event.items():
+                #     logger.debug(f"Node {node_name} executed")
+                    
+                #     # Show messages from tools
+                #     if "messages" in node_output:
+                #         messages = node_output["messages"]
+                #         if messages:
+                #             for msg in messages:
+                #                 if hasattr(msg, 'content') and msg.content:
+                #                     # Only show tool messages and important AI responses
+                #                     if type(msg) == ToolMessage:
+                #                         console.print(f"[dim]→ {str(msg.content)[:200]}...[/dim]")
+                #                     elif type(msg) == AIMessage:
+                #                         #  and not hasattr(msg, 'tool_calls')
+                #                         console.print(f"[cyan]AI: {str(msg.content)[:200]}...[/cyan]")
+                
+                # if event:
+                #     final_state = list(event.values())[0]
+        finally:
+            output.flush()
         
         logger.info(f"Agent execution completed after {step_count} steps")
         
@@ -111,16 +142,25 @@ async def execute_task(
 
 
 async def interactive_mode(debug: bool = False) -> None:
+    from rich.panel import Panel
+    from agent.graph import get_agent
+    from browser.manager import BrowserManager
+
+    console = _get_console()
     console.print(Panel(
         "[bold cyan]Browser AI Agent - Interactive Mode[/bold cyan]\n\n"
         "Enter tasks in natural language. Type 'exit' or 'quit' to stop.",
         border_style="cyan"
     ))
     
+    # one agent graph and one browser connection serve the whole session
     agent = get_agent()
+    browser_manager = BrowserManager()
+    await browser_manager.start()
     try:
         while True:
-            task = console.input("\n[bold cyan]Enter your task:[/bold cyan] ")
+            # prompt runs in a worker thread, so the event loop is not blocked on stdin
+            task = await asyncio.to_thread(console.input, "\n[bold cyan]Enter your task:[/bold cyan] ")
             
             if task.lower() in ("exit", "quit", "q"):
                 break
@@ -128,14 +168,15 @@ async def interactive_mode(debug: bool = False) -> None:
             if not task.strip():
                 continue
             
-            execute_task(
+            await execute_task(
                 task, 
                 debug,
-                agent
+                agent,
+                browser_manager,
             )
     
     finally:
-        BrowserManager().stop()
+        await browser_manager.stop()
 
 
 @click.command()
@@ -155,7 +196,7 @@ def main(task: str, debug: bool, interactive: bool):
         $ python main.py --interactive
     """
     if not task and not interactive:
-        console.print("[red]Error: Either provide a task or use --interactive mode[/red]")
+        click.secho("Error: Either provide a task or use --interactive mode", fg="red", err=True)
         sys.exit(1)
     
     if interactive:
@@ -2,14 +2,16 @@
 Pydantic models for page analysis and element information.
 """
 
-from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any, Tuple
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class ElementInfo(BaseModel):
     """
     Information about a specific page element.
     """
+    model_config = ConfigDict(frozen=True)
+
     selector: str = Field(
         description="CSS selector or other identifier for the element"
     )
@@ -20,10 +22,10 @@ class ElementInfo(BaseModel):
         default=None,
         description="Visible text in the element"
     )
-    attributes: Dict[str, str] = Field(
-        default_factory=dict,
-        description="HTML attributes of the element"
-    )
+    attributes: Tuple[Tuple[str, str], ...] = Field(
+        default=(),
+        description="HTML attributes of the element as (name, value) pairs"
+    )  # pairs instead of a dict: lighter per element on pages with hundreds of them
     is_visible: bool = Field(
         default=True,
         description="Whether the element is currently visible"
@@ -33,6 +35,18 @@ class ElementInfo(BaseModel):
         description="Whether the element can be clicked/interacted with"
     )
 
+    @field_validator("attributes", mode="before")
+    @classmethod
+    def _attributes_from_mapping(cls, value: Any) -> Any:
+        # attributes are still accepted as a dict, as they come from the page
+        if isinstance(value, dict):
+            return tuple(value.items())
+        return value
+
+    def attributes_as_dict(self) -> Dict[str, str]:
+        """HTML attributes of the element as a name -> value mapping"""
+        return dict(self.attributes)
+
 
 class PageAnalysis(BaseModel):
     """
@@ -1,5 +1,5 @@
 from typing import List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class TaskPlan(BaseModel):
@@ -14,23 +14,25 @@ class TaskPlan(BaseModel):
     )  # TODO: Edit description for AI to better understand planning
     
     def __str__(self) -> str:
-        ans = f"Current plan for the task '{self.task_description}':"
-        for step in self.steps:
-            ans += f"\n- {step}"
-        ans += "\n"
-        return ans
+        parts = [f"Current plan for the task '{self.task_description}':"]
+        parts.extend(f"- {step}" for step in self.steps)
+        return "\n".join(parts) + "\n"
 
 class DangerCheck(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     is_sensitive: bool = Field(
         default=False,
-        descrpition="Answer to whether suggested action is dangerous (i.e. sensitive); true if it is, false if it isn't"
+        description="Answer to whether suggested action is dangerous (i.e. sensitive); true if it is, false if it isn't"
     )
     reasoning: str = Field(
-        default=False,
-        descrpition="Reasoning to why is action sensitive"
+        default="",
+        description="Reasoning to why is action sensitive"
     )
 
 class PlanGoalAchieved(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     is_achieved: bool = Field(
         default=False,
         description="Answer to question whether curren plan goal achieved at this point"
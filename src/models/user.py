@@ -2,8 +2,9 @@
 Pydantic models for user preferences and confirmation requests.
 """
 
+import difflib
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, Field, EmailStr, PrivateAttr, model_validator
 
 
 class UserPreferences(BaseModel):
@@ -51,6 +52,18 @@ class UserPreferences(BaseModel):
         default_factory=dict,
         description="Additional user-specific data"
     )
+
+    # casefolded contact name -> email, kept in sync by add_contact; rebuilt on a lookup
+    # miss when contacts was changed directly
+    _normalized_index: Dict[str, str] = PrivateAttr(default_factory=dict)
+
+    @model_validator(mode="after")
+    def _build_contacts_index(self) -> "UserPreferences":
+        self._normalized_index = {
+            contact_name.casefold(): contact_email
+            for contact_name, contact_email in self.contacts.items()
+        }
+        return self
     
     def get_contact_email(self, name: str) -> Optional[str]:
         """
@@ -62,8 +75,24 @@ class UserPreferences(BaseModel):
         Returns:
             Email address if found, None otherwise
         """
-        # TODO: Implement fuzzy name matching
-        pass
+        key = name.strip().casefold()
+        if not key:
+            return None
+        email = self._normalized_index.get(key)
+        if email is None and len(self.contacts) != len(self._normalized_index):
+            self._build_contacts_index()
+            email = self._normalized_index.get(key)
+        if email is not None:
+            return email
+
+        # partial spelling: the first contact with a word starting with the given name
+        for contact_name, contact_email in self._normalized_index.items():
+            if any(word.startswith(key) for word in contact_name.split()):
+                return contact_email
+
+        # fuzzy fallback for typos in a name
+        matches = difflib.get_close_matches(key, self._normalized_index.keys(), n=1, cutoff=0.85)
+        return self._normalized_index[matches[0]] if matches else None
     
     def add_contact(self, name: str, email: str) -> None:
         """
@@ -73,8 +102,11 @@ class UserPreferences(BaseModel):
             name: Contact name
             email: Contact email address
         """
-        # TODO: Implement contact addition with validation
-        pass
+        name = name.strip()
+        if not name:
+            raise ValueError("Contact name must not be empty")
+        self.contacts[name] = email
+        self._normalized_index[name.casefold()] = email
 
 
 class ConfirmationRequest(BaseModel):
@@ -1,13 +1,23 @@
-from typing import Optional
+from functools import lru_cache
+from typing import Dict, Optional
+import httpx
+from langchain_core.runnables import Runnable
 from langchain_deepseek import ChatDeepSeek
 from langchain.chat_models import init_chat_model
 from config.settings import settings
 from utils.logger import logger
 
 
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+
 class LLMService:
     def __init__(self):
         self._main_llm: Optional[ChatDeepSeek] = None
+        self._structured_llms: Dict[type, Runnable] = {}  # schema -> main LLM with structured output
+        # one connection pool per service, so every LLM call reuses warm connections
+        self._http_client = httpx.Client(limits=_HTTP_LIMITS)
+        self._http_async_client = httpx.AsyncClient(limits=_HTTP_LIMITS)
     
     def get_main_llm(self) -> ChatDeepSeek:
         if self._main_llm is None:
@@ -16,16 +26,21 @@ class LLMService:
                 model=settings.default_llm_model,
                 base_url=settings.deepseek_base_url,
                 api_key=settings.deepseek_api_key,
+                http_client=self._http_client,
+                http_async_client=self._http_async_client,
             )
         
         return self._main_llm
 
-
-_llm_service: Optional[LLMService] = None
+    def get_structured_llm(self, schema: type) -> Runnable:
+        # output schema of a model does not change, so it is bound once per schema
+        structured = self._structured_llms.get(schema)
+        if structured is None:
+            structured = self.get_main_llm().with_structured_output(schema)
+            self._structured_llms[schema] = structured
+        return structured
 
 
+@lru_cache(maxsize=1)
 def get_llm_service() -> LLMService:
-    global _llm_service
-    if _llm_service is None:
-        _llm_service = LLMService()
-    return _llm_service
+    return LLMService()
@@ -0,0 +1,66 @@
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Sequence
+
+import orjson
+from langchain_core.messages import BaseMessage
+
+from config.settings import settings
+from utils.logger import logger
+
+
+class LLMCache:
+    """
+    In-memory LRU cache of structured LLM responses.
+    Keys are hashes of (model, output schema, request messages); values are
+    responses serialized to JSON, so cached objects are never shared between callers.
+    """
+
+    def __init__(self, max_size: int = 256):
+        self._max_size = max_size
+        self._entries: OrderedDict[str, str] = OrderedDict()
+
+    @staticmethod
+    def make_key(model: str, schema: type, messages: Sequence[BaseMessage]) -> str:
+        # message ids are assigned per run, so only role, content and tool calls
+        # take part in the key
+        payload = {
+            "model": model,
+            "schema": schema.__name__,
+            "messages": [
+                (
+                    msg.type,
+                    msg.content,
+                    [(tc["name"], tc["args"]) for tc in getattr(msg, "tool_calls", None) or ()],
+                )
+                for msg in messages
+            ],
+        }
+        return hashlib.sha256(
+            orjson.dumps(payload, default=str, option=orjson.OPT_SORT_KEYS)
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+            logger.debug("LLM cache hit: {}", key[:12])
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache() -> LLMCache:
+    return LLMCache(settings.llm_cache_size)
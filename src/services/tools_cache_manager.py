@@ -1,13 +1,22 @@
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, field
 
-from playwright.sync_api import Page
+from playwright.async_api import Page
 
 from browser.locator import ElementLocator
 
 from utils.logger import logger
 
 
+def _element_key(element: Dict[str, Any]) -> str:
+    # interactive elements are identified by their selector; informative ones have none,
+    # so their role and text stand in for it
+    selector = element.get("selector")
+    if selector is not None:
+        return selector
+    return f"{element.get('role')}:{element.get('contents')}"
+
+
 @dataclass
 class PageCache:
     interactive_cache: Dict[str, Dict[str, Any]] = field(default_factory=dict)
@@ -98,29 +107,30 @@ class ElementsCacheManager:
         """
         return self._cache_mapping.get(page_url).interactive_updates
 
-    def track_dom_changes(self, page: Page) -> None:
+    async def track_dom_changes(self, page: Page) -> None:
         # page value implied to be valid
         if self._cache_mapping.get(page.url, None) is None:
             self._cache_mapping[page.url] = PageCache()
 
-        info_cache = ElementLocator().list_informative_elements(page)
-        inter_cache = ElementLocator().list_interactive_elements(page)
-
-        delta_info = set(info_cache.values()).difference(
-            set(self._cache_mapping.get(page.url).informative_cache.values())
-        )
-        delta_inter = set(inter_cache.values()).difference(
-            set(self._cache_mapping.get(page.url).interactive_cache.values())
-        )
-
-        if len(delta_info) != 0:
-            self._cache_mapping.get(page.url).informative_cache = info_cache 
-            for element in delta_info:
-                self._cache_mapping.get(page.url).info_updates[element["selector"]] = element
-        if len(delta_inter) != 0:
-            self._cache_mapping.get(page.url).interactive_cache = inter_cache
-            for element in delta_inter:
-                self._cache_mapping.get(page.url).interactive_updates[element["selector"]] = element
+        info_list, inter_list = await ElementLocator().list_all(page)
+        page_cache = self._cache_mapping[page.url]
+
+        # list_all returns plain lists of dicts; they are keyed here, and only the keys are
+        # compared, since dicts are unhashable and cannot be put into a set
+        info_cache = {_element_key(element): element for element in info_list}
+        inter_cache = {_element_key(element): element for element in inter_list}
+
+        new_info = info_cache.keys() - page_cache.informative_cache.keys()
+        new_inter = inter_cache.keys() - page_cache.interactive_cache.keys()
+
+        if new_info:
+            page_cache.informative_cache = info_cache
+            for key in new_info:
+                page_cache.info_updates[key] = info_cache[key]
+        if new_inter:
+            page_cache.interactive_cache = inter_cache
+            for key in new_inter:
+                page_cache.interactive_updates[key] = inter_cache[key]
 
     def del_info_updates(self, page_url: str):
         self._cache_mapping.get(page_url, PageCache()).info_updates.clear()
@@ -0,0 +1,18 @@
+from functools import lru_cache
+
+from langchain.tools import BaseTool
+
+from tools.interaction import create_interaction_tools
+from tools.navigation import create_navigation_tools
+
+
+@lru_cache(maxsize=1)
+def get_all_tools() -> tuple[BaseTool, ...]:
+    """
+    Registry of all browser tools available to the agent.
+    Tools are stateless wrappers around BrowserManager, so they are created once per process.
+    
+    Returns:
+        Tuple of interaction and navigation tools
+    """
+    return tuple(create_interaction_tools() + create_navigation_tools())
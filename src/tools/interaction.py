@@ -1,6 +1,8 @@
+import asyncio
 import time
 from typing import List, Dict
 
+import orjson
 from langchain.tools import BaseTool
 from pydantic import BaseModel, Field
 from playwright._impl._errors import TimeoutError as PlaywrightTimeoutError
@@ -11,6 +13,37 @@ from config.settings import settings
 from utils.logger import logger
 from services.tools_cache_manager import ElementsCacheManager
 
+# walks up the parents of an element until one holding text is found;
+# shared by sync and async implementations of get_element_context
+_ELEMENT_CONTEXT_JS = '''(el) => {
+    const context = [];
+    let current = el.parentElement;
+    let level = 0;
+    const maxLevels = 5;
+    
+    while (current && level < maxLevels) {
+        const text = current.innerText?.trim() || '';
+        const hasText = text.length > 0;
+        
+        context.push({
+            level: level + 1,
+            tagName: current.tagName.toLowerCase(),
+            id: current.id || null,
+            className: current.className || null,
+            text: hasText ? text.substring(0, 300) : null,
+            hasText: hasText
+        });
+        
+        if (hasText) break;
+        
+        current = current.parentElement;
+        level++;
+    }
+    
+    return context;
+}'''
+
+
 class ClickElementInput(BaseModel):
     """Input schema for clicking an element."""
     element_selector: str = Field(
@@ -66,7 +99,7 @@ class ClickElementTool(BaseTool):
         if not page:
             return "Error: Browser not connected. Use the browser manager to connect first."
         
-        cache = ElementsCacheManager().get_cache(await page.url)
+        cache = ElementsCacheManager().get_cache(page.url)
 
         if cache is None or element_selector not in cache.keys():
             return f"Error: Element with selector {element_selector} not found. Use 'get_interactive_elements' first to get the list of elements."
@@ -267,10 +300,10 @@ class InputTextTool(BaseTool):
                 await element.scroll_into_view_if_needed()
             
             await element.click()
-            time.sleep(0.2)
+            await asyncio.sleep(0.2)
             
             await element.fill("")
-            time.sleep(0.1)
+            await asyncio.sleep(0.1)
             
             await element.type(text, delay=self.typing_delay)
             
@@ -351,6 +384,7 @@ class GetElementContextTool(BaseTool):
         exclude=True, 
         default_factory=BrowserManager,
     )
+    parallel_safe: bool = Field(default=True, exclude=True)  # read-only, may run concurrently
 
     async def _arun(self, element_selector: int) -> str:
         """
@@ -384,33 +418,7 @@ class GetElementContextTool(BaseTool):
             text_substring_size = 200  # defines how much symbols of context text should 
             # be passed to an agent
 
-            context_info = await element.evaluate('''(el) => {
-                const context = [];
-                let current = el.parentElement;
-                let level = 0;
-                const maxLevels = 5;
-                
-                while (current && level < maxLevels) {
-                    const text = current.innerText?.trim() || '';
-                    const hasText = text.length > 0;
-                    
-                    context.push({
-                        level: level + 1,
-                        tagName: current.tagName.toLowerCase(),
-                        id: current.id || null,
-                        className: current.className || null,
-                        text: hasText ? text.substring(0, 300) : null,
-                        hasText: hasText
-                    });
-                    
-                    if (hasText) break;
-                    
-                    current = current.parentElement;
-                    level++;
-                }
-                
-                return context;
-            }''')
+            context_info = await element.evaluate(_ELEMENT_CONTEXT_JS)
             
             # Format the context information
             result = f"Context for element {element_selector} ({element_info.get('type')}):\n\n"
@@ -468,33 +476,7 @@ class GetElementContextTool(BaseTool):
             text_substring_size = 200  # defines how much symbols of context text should 
             # be passed to an agent
 
-            context_info = element.evaluate('''(el) => {
-                const context = [];
-                let current = el.parentElement;
-                let level = 0;
-                const maxLevels = 5;
-                
-                while (current && level < maxLevels) {
-                    const text = current.innerText?.trim() || '';
-                    const hasText = text.length > 0;
-                    
-                    context.push({
-                        level: level + 1,
-                        tagName: current.tagName.toLowerCase(),
-                        id: current.id || null,
-                        className: current.className || null,
-                        text: hasText ? text.substring(0, 300) : null,
-                        hasText: hasText
-                    });
-                    
-                    if (hasText) break;
-                    
-                    current = current.parentElement;
-                    level++;
-                }
-                
-                return context;
-            }''')
+            context_info = element.evaluate(_ELEMENT_CONTEXT_JS)
             
             # Format the context information
             result = f"Context for element {element_selector} ({element_info.get('type')}):\n\n"
@@ -537,6 +519,7 @@ class GetInteractiveElementsTool(BaseTool):
         exclude=True, 
         default_factory=BrowserManager,
     )
+    parallel_safe: bool = Field(default=False, exclude=True)  # writes ElementsCacheManager, runs in order
     
     async def _arun(self) -> str:
         """
@@ -579,7 +562,7 @@ class GetInteractiveElementsTool(BaseTool):
                     by_type[elem_type] = list()
                 by_type[elem_type].append(elem)
             
-            result += str(by_type) + f"\nTotal: {len(elements)} elements available for interaction"
+            result += orjson.dumps(by_type).decode() + f"\nTotal: {len(elements)} elements available for interaction"
             
             logger.info(f"Cached {len(elements)} elements")
             return result
@@ -623,7 +606,7 @@ class GetInteractiveElementsTool(BaseTool):
                     by_type[elem_type] = []
                 by_type[elem_type].append(elem)
             
-            result += str(by_type) + f"\nTotal: {len(elements)} elements available for interaction"
+            result += orjson.dumps(by_type).decode() + f"\nTotal: {len(elements)} elements available for interaction"
             
             logger.info(f"Cached {len(elements)} elements")
             return result
@@ -653,6 +636,7 @@ class GetInformativeElementsTool(BaseTool):
         exclude=True, 
         default_factory=BrowserManager,
     )
+    parallel_safe: bool = Field(default=False, exclude=True)  # writes ElementsCacheManager, runs in order
 
     async def _arun(self) -> str:
         """
@@ -692,7 +676,7 @@ class GetInformativeElementsTool(BaseTool):
                     by_type[elem_type] = []
                 by_type[elem_type].append(elem)
             
-            result += str(by_type) + f"\nTotal: {len(elements)} elements available for interaction"
+            result += orjson.dumps(by_type).decode() + f"\nTotal: {len(elements)} elements available for interaction"
             
             logger.info(f"Cached {len(elements)} elements")
             return result
@@ -739,7 +723,7 @@ class GetInformativeElementsTool(BaseTool):
                     by_type[elem_type] = []
                 by_type[elem_type].append(elem)
             
-            result += str(by_type) + f"\nTotal: {len(elements)} elements available for interaction"
+            result += orjson.dumps(by_type).decode() + f"\nTotal: {len(elements)} elements available for interaction"
             
             logger.info(f"Cached {len(elements)} elements")
             return result
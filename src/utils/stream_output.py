@@ -0,0 +1,70 @@
+"""
+Batched console output of streamed LLM tokens.
+"""
+
+import asyncio
+import sys
+from functools import lru_cache
+from typing import Optional
+
+
+class StreamBatcher:
+    """
+    Buffers streamed tokens and writes them to stdout in batches.
+    A batch is flushed on newline, once it reaches the size threshold or after
+    max_delay seconds without a flush; the threshold grows after every
+    size-triggered flush, so fast streams are written in ever larger pieces.
+    Anything printing to the console by other means should call flush() first,
+    so the streamed text is not shown out of order.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 16,
+        max_batch_size: int = 256,
+        growth_factor: int = 3,
+        max_delay: float = 0.05,
+    ):
+        self._buffer: list[str] = []
+        self._buffered = 0
+        self._batch_size = batch_size
+        self._max_batch_size = max_batch_size
+        self._growth_factor = growth_factor
+        self._max_delay = max_delay
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def write(self, text: str) -> None:
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered >= self._batch_size:
+            self._batch_size = min(self._batch_size * self._growth_factor, self._max_batch_size)
+            self.flush()
+        elif "\n" in text:
+            self.flush()
+        else:
+            self._schedule_flush()
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._buffer:
+            sys.stdout.write("".join(self._buffer))
+            sys.stdout.flush()
+            self._buffer.clear()
+            self._buffered = 0
+
+    def _schedule_flush(self) -> None:
+        # idle timer: the tail of a stream is written even if no token follows it
+        if self._timer is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # outside of a loop the buffer waits for the next write or flush()
+        self._timer = loop.call_later(self._max_delay, self.flush)
+
+
+@lru_cache(maxsize=1)
+def get_stream_output() -> StreamBatcher:
+    return StreamBatcher()